@@ -0,0 +1,88 @@
+"""
+BOTFUSIONS - CHAT DISPATCHER
+Single-flight deduplication of concurrent chat requests
+"""
+
+import asyncio
+from typing import Optional, Dict, Any, Tuple
+import logging
+
+from memori_service import MemoriService, get_memori_service
+
+logger = logging.getLogger(__name__)
+
+# (namespace, model, system_prompt, message)
+_Key = Tuple[str, str, Optional[str], str]
+
+
+class ChatDispatcher:
+    """
+    Share one OpenAI call between identical in-flight chat requests
+
+    A request identical to one already running (same namespace, model,
+    system prompt and message) awaits that call instead of starting its own.
+    Other requests go straight to MemoriService.chat with no added latency.
+    """
+
+    def __init__(self):
+        """Initialize dispatcher"""
+        self._inflight: Dict[_Key, asyncio.Task] = {}
+
+    async def stop(self):
+        """Wait for in-flight calls to finish"""
+        if self._inflight:
+            await asyncio.gather(*self._inflight.values(), return_exceptions=True)
+
+    async def submit(
+        self,
+        service: MemoriService,
+        message: str,
+        model: str = "gpt-4o-mini",
+        system_prompt: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Run a chat request, joining an identical in-flight call if there is one
+
+        Returns:
+            Same dict as MemoriService.chat
+
+        Raises:
+            openai.APIError: OpenAI request failed
+        """
+        key = (service.namespace, model, system_prompt, message)
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._call(service, message, model, system_prompt))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            logger.debug("Joining in-flight chat - namespace: %s", service.namespace)
+
+        # Shield so one disconnecting client does not cancel the shared call
+        return await asyncio.shield(task)
+
+    def _forget(self, key: _Key, task: asyncio.Task):
+        """Drop a finished call (and mark its error retrieved if every waiter left)"""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()
+
+    @staticmethod
+    async def _call(
+        service: MemoriService,
+        message: str,
+        model: str,
+        system_prompt: Optional[str]
+    ) -> Dict[str, Any]:
+        """Run one chat call"""
+        if service.closed:
+            # Evicted before the call started; use the live service for the same key
+            service = await get_memori_service(namespace=service.namespace)
+
+        return await service.chat(
+            message=message,
+            model=model,
+            system_prompt=system_prompt
+        )
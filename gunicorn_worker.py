@@ -0,0 +1,17 @@
+"""
+BOTFUSIONS - GUNICORN WORKER
+Uvicorn worker class with flow-control limits for production
+"""
+
+from uvicorn_worker import UvicornWorker
+
+
+class MemoriUvicornWorker(UvicornWorker):
+    """UvicornWorker that caps concurrent connections per worker"""
+
+    # gunicorn's --worker-connections is ignored by uvicorn workers,
+    # so limit_concurrency has to be passed through CONFIG_KWARGS
+    CONFIG_KWARGS = {
+        **UvicornWorker.CONFIG_KWARGS,
+        "limit_concurrency": 1000,
+    }
@@ -5,13 +5,26 @@ FastAPI REST API for Memori service
 
 from fastapi import FastAPI, HTTPException, Header
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel, Field
 from typing import Optional, List, Dict, Any
-import os
+from contextlib import asynccontextmanager
 import logging
+import orjson
+import openai
 from dotenv import load_dotenv
 
-from memori_service import get_memori_service
+from memori_service import (
+    settings,
+    parse_db_host,
+    get_memori_service,
+    list_active_namespaces,
+    open_shared_http,
+    close_shared_http,
+    close_all_services
+)
+from chat_dispatcher import ChatDispatcher
 
 # Load environment
 load_dotenv()
@@ -23,11 +36,50 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Single-flight deduplication of identical in-flight chats
+dispatcher = ChatDispatcher()
+
+
+# ============================================
+# LIFESPAN
+# ============================================
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Startup/shutdown lifecycle"""
+    logger.info("🚀 Botfusions Memori API starting...")
+    logger.info("📡 Database: %s", parse_db_host(settings.memori_database__connection_string))
+    logger.info("🔑 OpenAI: Configured")
+
+    open_shared_http()
+
+    try:
+        # Warm Memori + OpenAI connections so the first request skips cold start
+        for namespace in settings.warm_namespaces:
+            try:
+                service = await get_memori_service(namespace=namespace)
+                await service._aensure_memori()
+                await service.openai_client.models.list()
+                logger.info("🔥 Warmed namespace: %s", namespace)
+            except Exception as e:
+                logger.warning("Warmup failed for namespace %s: %s", namespace, e)
+
+        yield
+
+    finally:
+        logger.info("👋 Botfusions Memori API shutting down...")
+        await dispatcher.stop()
+        await close_all_services()
+        await close_shared_http()
+
+
 # FastAPI app
 app = FastAPI(
     title="Botfusions Memori API",
     description="AI Memory API powered by Memori SDK",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
     contact={
         "name": "Botfusions",
         "email": "info@botfusions.com",
@@ -44,6 +96,23 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# GZip (compress JSON responses above 1 KB)
+# Streaming endpoints are skipped: gzip buffers SSE chunks
+STREAMING_PATHS = {"/chat/stream"}
+
+
+class NonStreamingGZipMiddleware(GZipMiddleware):
+    """GZipMiddleware that passes streaming endpoints through untouched"""
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"] in STREAMING_PATHS:
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+
+app.add_middleware(NonStreamingGZipMiddleware, minimum_size=1000, compresslevel=5)
+
 
 # ============================================
 # REQUEST/RESPONSE MODELS
@@ -84,6 +153,23 @@ class MemoryStatsResponse(BaseModel):
 # ENDPOINTS
 # ============================================
 
+def upstream_status(error: openai.APIError) -> int:
+    """
+    Map an OpenAI error to the status returned to our client
+
+    Rate limits become 429. Other 4xx caused by the request (bad model,
+    context too long, ...) pass through. Auth/permission errors concern our
+    API key, so they count as upstream failures like connection errors,
+    timeouts and 5xx: 502.
+    """
+    if isinstance(error, openai.RateLimitError):
+        return 429
+    if isinstance(error, openai.APIStatusError):
+        if 400 <= error.status_code < 500 and error.status_code not in (401, 403):
+            return error.status_code
+    return 502
+
+
 @app.get("/", response_model=HealthResponse)
 async def root():
     """Root endpoint"""
@@ -118,37 +204,83 @@ async def chat(request: ChatRequest):
     }
 ```
     """
-    try:
-        # Get service
-        service = get_memori_service(
-            namespace=request.namespace,
-            user_id=request.user_id
-        )
+    # Get service (already isolated per namespace/user)
+    service = await get_memori_service(
+        namespace=request.namespace,
+        user_id=request.user_id
+    )
 
-        # Chat
-        result = service.chat(
+    # Chat (identical in-flight requests share one call)
+    try:
+        result = await dispatcher.submit(
+            service,
             message=request.message,
-            user_id=request.user_id,
             model=request.model,
             system_prompt=request.system_prompt
         )
-
-        if result["success"]:
-            return ChatResponse(
-                success=True,
-                response=result["response"],
-                metadata={
-                    "model": result["model"],
-                    "namespace": result["namespace"],
-                    "usage": result["usage"]
-                }
-            )
+    except openai.APIError as e:
+        status_code = upstream_status(e)
+        if status_code < 500:
+            logger.warning("Chat rejected by OpenAI (%d): %s", status_code, e)
         else:
-            raise HTTPException(status_code=500, detail=result["error"])
+            logger.error("Chat upstream error: %s", e)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.exception("Chat upstream error traceback")
+        raise HTTPException(status_code=status_code, detail=str(e))
+
+    return ChatResponse(
+        success=True,
+        response=result["response"],
+        metadata={
+            "model": result["model"],
+            "namespace": result["namespace"],
+            "cached": result["cached"],
+            "usage": result["usage"]
+        }
+    )
+
+
+@app.post("/chat/stream")
+async def chat_stream(request: ChatRequest):
+    """
+    Chat with memory, streamed as Server-Sent Events
+
+    Each event is `data: {"delta": "..."}`; the stream ends with
+    `data: [DONE]`, or `data: {"error": "..."}` on failure.
+    """
+    service = await get_memori_service(
+        namespace=request.namespace,
+        user_id=request.user_id
+    )
 
-    except Exception as e:
-        logger.error(f"Chat error: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    async def generator():
+        live_service = service
+        if live_service.closed:
+            # Evicted before the stream started; use the live service for the same key
+            live_service = await get_memori_service(namespace=service.namespace)
+
+        try:
+            async for delta in live_service.chat_stream(
+                message=request.message,
+                model=request.model,
+                system_prompt=request.system_prompt
+            ):
+                yield f"data: {orjson.dumps({'delta': delta}).decode()}\n\n"
+        except openai.APIError as e:
+            logger.error("Chat stream error: %s", e)
+            yield f"data: {orjson.dumps({'error': str(e)}).decode()}\n\n"
+            return
+
+        yield "data: [DONE]\n\n"
+
+    return StreamingResponse(
+        generator(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"
+        }
+    )
 
 
 @app.get("/memory/stats", response_model=MemoryStatsResponse)
@@ -163,45 +295,22 @@ async def memory_stats(
     - namespace: Memory namespace (default: "default")
     - user_id: Optional user ID
     """
-    try:
-        service = get_memori_service(namespace=namespace, user_id=user_id)
-        stats = service.get_memory_stats()
-        return stats
-
-    except Exception as e:
-        logger.error(f"Stats error: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    # Resolve the service even on cached stats so its LRU position stays fresh
+    service = await get_memori_service(namespace=namespace, user_id=user_id)
+    return await service.get_memory_stats()
 
 
 @app.get("/memory/namespaces")
 async def list_namespaces():
     """List all active namespaces"""
-    from memori_service import _services
+    namespaces = await list_active_namespaces()
 
     return {
-        "namespaces": list(_services.keys()),
-        "count": len(_services)
+        "namespaces": namespaces,
+        "count": len(namespaces)
     }
 
 
-# ============================================
-# STARTUP/SHUTDOWN
-# ============================================
-
-@app.on_event("startup")
-async def startup_event():
-    """Startup event"""
-    logger.info("🚀 Botfusions Memori API starting...")
-    logger.info(f"📡 Database: {os.getenv('MEMORI_DATABASE__CONNECTION_STRING', 'Not configured')[:50]}...")
-    logger.info(f"🔑 OpenAI: {'Configured' if os.getenv('OPENAI_API_KEY') else 'Not configured'}")
-
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Shutdown event"""
-    logger.info("👋 Botfusions Memori API shutting down...")
-
-
 # ============================================
 # MAIN
 # ============================================
@@ -212,5 +321,8 @@ if __name__ == "__main__":
         "memori_api:app",
         host="0.0.0.0",
         port=8002,
-        reload=True
+        reload=True,  # Dev only; production runs under gunicorn (see Dockerfile)
+        backlog=2048,
+        limit_concurrency=1000,
+        timeout_keep_alive=5
     )
@@ -4,14 +4,82 @@ Core Memori business logic
 """
 
 from memori import Memori
-from openai import OpenAI
-import os
-from typing import Optional, List, Dict, Any
+from openai import AsyncOpenAI, APIError
+from cachetools import LRUCache, TTLCache
+from pydantic_settings import BaseSettings, SettingsConfigDict
+from contextlib import contextmanager, aclosing
+import asyncio
+import httpx
+from typing import Optional, List, Dict, Any, AsyncIterator, Tuple
 import logging
 
+from semantic_cache import SemanticCache
+
 logger = logging.getLogger(__name__)
 
 
+class Settings(BaseSettings):
+    """Service configuration, resolved once at import (fails fast if missing)"""
+
+    model_config = SettingsConfigDict(env_file=".env", extra="ignore")
+
+    memori_database__connection_string: str
+    openai_api_key: str
+    memori_semantic_cache_ttl: float = 300
+    memori_warm_namespaces: str = "default"  # comma-separated, warmed at startup
+
+    @property
+    def warm_namespaces(self) -> List[str]:
+        """Namespaces to warm at startup"""
+        return [ns.strip() for ns in self.memori_warm_namespaces.split(",") if ns.strip()]
+
+
+settings = Settings()
+
+
+def parse_db_host(database_url: Optional[str]) -> str:
+    """Extract host[:port] from a connection string (never the credentials)"""
+    if database_url and "@" in database_url:
+        return database_url.rsplit("@", 1)[1].split("/", 1)[0]
+    return "unknown"
+
+# Reported on cache hits: no OpenAI tokens were spent
+ZERO_USAGE = {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+
+# Embedding model used for semantic cache lookups
+EMBEDDING_MODEL = "text-embedding-3-small"
+
+# Shared HTTP connection pool for all OpenAI clients (opened by the API lifespan)
+_shared_http: Optional[httpx.AsyncClient] = None
+
+
+def open_shared_http() -> httpx.AsyncClient:
+    """Create the shared OpenAI HTTP connection pool unless it is already open"""
+    global _shared_http
+    if _shared_http is None or _shared_http.is_closed:
+        _shared_http = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=200, max_keepalive_connections=100),
+            timeout=httpx.Timeout(600.0, connect=5.0),
+            follow_redirects=True,
+            http2=True
+        )
+    return _shared_http
+
+
+async def close_shared_http():
+    """Close the shared OpenAI HTTP connection pool"""
+    global _shared_http
+    if _shared_http is not None:
+        await _shared_http.aclose()
+        _shared_http = None
+
+# Response cache shared by all services (bounded across namespaces)
+_response_cache = SemanticCache(ttl=settings.memori_semantic_cache_ttl)
+
+# Memory stats cache (bounded, 30s TTL), keyed by service namespace
+_stats_cache: TTLCache = TTLCache(maxsize=1024, ttl=30)
+
+
 class MemoriService:
     """Memori service wrapper"""
 
@@ -26,33 +94,128 @@ class MemoriService:
         self.openai_api_key = openai_api_key
         self.namespace = namespace
 
+        # Parsed once; database_url never changes per service
+        self._db_host = parse_db_host(database_url)
+
         # Memori instance
         self.memori = None
         self.openai_client = None
 
-        logger.info(f"MemoriService initialized with namespace: {namespace}")
+        # In-flight calls; eviction defers closing until they finish
+        self._active = 0
+        self._closing = False
+        self.closed = False
+
+        # Serializes first-time Memori setup between concurrent requests
+        self._init_lock = asyncio.Lock()
+
+        logger.info("MemoriService initialized with namespace: %s", namespace)
+
+    def _create_memori(self) -> Memori:
+        """Build and enable Memori (blocking: DB handshake + schema init)"""
+        memori = Memori(
+            database_connect=self.database_url,
+            conscious_ingest=True,  # Short-term working memory
+            auto_ingest=True,       # Dynamic search per query
+            openai_api_key=self.openai_api_key,
+            namespace=self.namespace
+        )
+        memori.enable()
+        return memori
+
+    async def _aensure_memori(self):
+        """Ensure Memori is initialized and enabled, without blocking the event loop"""
+        if self.closed:
+            raise RuntimeError(f"MemoriService for namespace {self.namespace} is closed")
 
-    def _ensure_memori(self):
-        """Ensure Memori is initialized and enabled"""
         if self.memori is None:
-            self.memori = Memori(
-                database_connect=self.database_url,
-                conscious_ingest=True,  # Short-term working memory
-                auto_ingest=True,       # Dynamic search per query
-                openai_api_key=self.openai_api_key,
-                namespace=self.namespace
-            )
-            self.memori.enable()
-            logger.info(f"Memori enabled for namespace: {self.namespace}")
+            async with self._init_lock:
+                if self.memori is None:
+                    memori = await asyncio.to_thread(self._create_memori)
+                    if self.closed:
+                        memori.disable()
+                        raise RuntimeError(f"MemoriService for namespace {self.namespace} is closed")
+                    self.memori = memori
+                    logger.info("Memori enabled for namespace: %s", self.namespace)
 
         if self.openai_client is None:
-            self.openai_client = OpenAI(api_key=self.openai_api_key)
+            self.openai_client = AsyncOpenAI(
+                api_key=self.openai_api_key,
+                http_client=open_shared_http()
+            )
             logger.info("OpenAI client initialized")
 
-    def chat(
+    async def _embed(self, text: str) -> Optional[List[float]]:
+        """Embed text for semantic cache lookup (None on failure)"""
+        try:
+            response = await self.openai_client.embeddings.create(
+                model=EMBEDDING_MODEL,
+                input=text
+            )
+            return response.data[0].embedding
+        except APIError as e:
+            logger.warning("Embedding error: %s", e)
+            return None
+
+    async def _cache_lookup(
+        self,
+        cache_partition: Tuple[str, str, str],
+        message: str
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[List[float]]]:
+        """Semantic cache: exact match first, then nearest embedding"""
+        cached = _response_cache.get_exact(cache_partition, message)
+        embedding = None
+        if cached is None:
+            embedding = await self._embed(message)
+            if embedding is not None:
+                cached = _response_cache.get_similar(cache_partition, embedding)
+
+        return cached, embedding
+
+    def _record_conversation(self, message: str, response_text: str, model: str):
+        """
+        Record a turn that bypassed Memori's OpenAI hook (streams, cache hits)
+
+        Errors are logged, not raised: the response is already produced.
+        """
+        try:
+            self.memori.record_conversation(
+                user_input=message,
+                ai_output=response_text,
+                model=model
+            )
+        except Exception as e:
+            logger.warning("Chat recording error - namespace: %s: %s", self.namespace, e)
+
+    @staticmethod
+    def _build_messages(message: str, system_prompt: Optional[str]) -> List[Dict[str, str]]:
+        """
+        Build OpenAI chat messages
+
+        Dicts are built fresh per call because Memori may inject context into
+        them in place. The system prompt stays first, so repeated prompts share
+        an identical prefix for OpenAI prompt caching.
+        """
+        messages = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        messages.append({"role": "user", "content": message})
+        return messages
+
+    @contextmanager
+    def _in_use(self):
+        """Track an in-flight call so eviction waits for it"""
+        self._active += 1
+        try:
+            yield
+        finally:
+            self._active -= 1
+            if self._closing and self._active == 0:
+                self._close()
+
+    async def chat(
         self,
         message: str,
-        user_id: Optional[str] = None,
         model: str = "gpt-4o-mini",
         system_prompt: Optional[str] = None
     ) -> Dict[str, Any]:
@@ -61,67 +224,205 @@ class MemoriService:
 
         Args:
             message: User message
-            user_id: Optional user ID for multi-user isolation
             model: OpenAI model to use
             system_prompt: Optional system prompt
 
         Returns:
             Dict with response and metadata
+
+        Raises:
+            openai.APIError: OpenAI request failed
         """
-        self._ensure_memori()
+        with self._in_use():
+            return await self._chat(message, model, system_prompt)
 
-        # Build messages
-        messages = []
-        if system_prompt:
-            messages.append({"role": "system", "content": system_prompt})
-        messages.append({"role": "user", "content": message})
+    async def _chat(
+        self,
+        message: str,
+        model: str,
+        system_prompt: Optional[str]
+    ) -> Dict[str, Any]:
+        """Chat implementation (see chat)"""
+        await self._aensure_memori()
 
-        # Call OpenAI with Memori
-        try:
-            response = self.openai_client.chat.completions.create(
-                model=model,
-                messages=messages
-            )
+        cache_partition = (self.namespace, model, system_prompt or "")
+        cached, embedding = await self._cache_lookup(cache_partition, message)
+        if cached is not None:
+            logger.info("Chat cache hit - namespace: %s", self.namespace)
+            self._record_conversation(message, cached["response"], model)
+            return {**cached, "cached": True, "usage": dict(ZERO_USAGE)}
 
-            result = {
-                "success": True,
-                "response": response.choices[0].message.content,
-                "model": model,
-                "namespace": self.namespace,
-                "usage": {
-                    "prompt_tokens": response.usage.prompt_tokens,
-                    "completion_tokens": response.usage.completion_tokens,
-                    "total_tokens": response.usage.total_tokens
-                }
-            }
+        messages = self._build_messages(message, system_prompt)
 
-            logger.info(f"Chat successful - namespace: {self.namespace}, tokens: {response.usage.total_tokens}")
-            return result
+        # Call OpenAI with Memori (openai.APIError propagates to the caller)
+        response = await self.openai_client.chat.completions.create(
+            model=model,
+            messages=messages
+        )
 
-        except Exception as e:
-            logger.error(f"Chat error: {str(e)}")
-            return {
-                "success": False,
-                "error": str(e),
-                "namespace": self.namespace
+        result = {
+            "success": True,
+            "response": response.choices[0].message.content,
+            "model": model,
+            "namespace": self.namespace,
+            "cached": False,
+            "usage": {
+                "prompt_tokens": response.usage.prompt_tokens,
+                "completion_tokens": response.usage.completion_tokens,
+                "total_tokens": response.usage.total_tokens
             }
+        }
 
-    def get_memory_stats(self) -> Dict[str, Any]:
-        """Get memory statistics"""
-        self._ensure_memori()
+        _response_cache.put(cache_partition, message, result, embedding)
+
+        logger.info("Chat successful - namespace: %s, tokens: %d", self.namespace, response.usage.total_tokens)
+        return result
+
+    async def chat_stream(
+        self,
+        message: str,
+        model: str = "gpt-4o-mini",
+        system_prompt: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """
+        Chat with memory, yielding response text as it is generated
+
+        Args:
+            message: User message
+            model: OpenAI model to use
+            system_prompt: Optional system prompt
+
+        Yields:
+            Response text deltas
+        """
+        with self._in_use():
+            async with aclosing(self._chat_stream(message, model, system_prompt)) as deltas:
+                async for delta in deltas:
+                    yield delta
+
+    async def _chat_stream(
+        self,
+        message: str,
+        model: str,
+        system_prompt: Optional[str]
+    ) -> AsyncIterator[str]:
+        """Streaming chat implementation (see chat_stream)"""
+        await self._aensure_memori()
+
+        cache_partition = (self.namespace, model, system_prompt or "")
+        cached, embedding = await self._cache_lookup(cache_partition, message)
+        if cached is not None:
+            logger.info("Chat stream cache hit - namespace: %s", self.namespace)
+            self._record_conversation(message, cached["response"], model)
+            yield cached["response"]
+            return
+
+        messages = self._build_messages(message, system_prompt)
 
-        return {
+        stream = await self.openai_client.chat.completions.create(
+            model=model,
+            messages=messages,
+            stream=True,
+            stream_options={"include_usage": True}
+        )
+
+        parts = []
+        usage = None
+        # Closes the response (and frees its pooled connection) on client disconnect
+        async with stream:
+            async for chunk in stream:
+                if chunk.usage is not None:
+                    usage = chunk.usage
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    parts.append(delta)
+                    yield delta
+
+        if usage is None:
+            return
+
+        response_text = "".join(parts)
+
+        # Memori's OpenAI hook skips streamed responses, so record the turn here
+        self._record_conversation(message, response_text, model)
+
+        result = {
+            "success": True,
+            "response": response_text,
+            "model": model,
             "namespace": self.namespace,
-            "database": self.database_url.split("@")[1].split("/")[0] if "@" in self.database_url else "unknown",
-            "status": "active"
+            "cached": False,
+            "usage": {
+                "prompt_tokens": usage.prompt_tokens,
+                "completion_tokens": usage.completion_tokens,
+                "total_tokens": usage.total_tokens
+            }
         }
+        _response_cache.put(cache_partition, message, result, embedding)
+
+        logger.info("Chat stream successful - namespace: %s, tokens: %d", self.namespace, usage.total_tokens)
+
+    async def get_memory_stats(self) -> Dict[str, Any]:
+        """Get memory statistics"""
+        with self._in_use():
+            stats = _stats_cache.get(self.namespace)
+            if stats is None:
+                await self._aensure_memori()
+                stats = {
+                    "namespace": self.namespace,
+                    "database": self._db_host,
+                    "status": "active"
+                }
+                _stats_cache[self.namespace] = stats
+
+            return stats
+
+    async def aclose(self):
+        """Close now, or once the last in-flight call finishes"""
+        self._closing = True
+        if self._active == 0:
+            self._close()
+
+    def _close(self):
+        """Release Memori resources (the shared HTTP pool stays open)"""
+        if self.closed:
+            return
+        self.closed = True
+
+        if self.memori is not None:
+            try:
+                self.memori.disable()
+            except Exception as e:
+                logger.warning("Memori disable error: %s", e)
+            self.memori = None
 
+        _response_cache.clear(self.namespace)
+        _stats_cache.pop(self.namespace, None)
+        logger.info("MemoriService closed for namespace: %s", self.namespace)
 
-# Singleton factory
-_services: Dict[str, MemoriService] = {}
 
+class _ServiceCache(LRUCache):
+    """LRU cache of services that collects evicted entries for cleanup"""
 
-def get_memori_service(
+    def __init__(self, maxsize: int):
+        super().__init__(maxsize=maxsize)
+        self.evicted: List[MemoriService] = []
+
+    def popitem(self):
+        key, service = super().popitem()
+        self.evicted.append(service)
+        return key, service
+
+
+# Singleton factory (bounded, least recently used services are evicted)
+MAX_SERVICES = 1024
+_services: _ServiceCache = _ServiceCache(maxsize=MAX_SERVICES)
+_lock = asyncio.Lock()
+
+
+async def get_memori_service(
     namespace: str = "default",
     user_id: Optional[str] = None
 ) -> MemoriService:
@@ -142,11 +443,36 @@ def get_memori_service(
         key = namespace
 
     # Get or create
-    if key not in _services:
-        _services[key] = MemoriService(
-            database_url=os.getenv("MEMORI_DATABASE__CONNECTION_STRING"),
-            openai_api_key=os.getenv("OPENAI_API_KEY"),
-            namespace=key
-        )
+    async with _lock:
+        service = _services.get(key)
+        if service is None:
+            service = MemoriService(
+                database_url=settings.memori_database__connection_string,
+                openai_api_key=settings.openai_api_key,
+                namespace=key
+            )
+            _services[key] = service
+
+        evicted, _services.evicted = _services.evicted, []
+
+    # Close evicted services outside the lock
+    for old_service in evicted:
+        await old_service.aclose()
+
+    return service
+
+
+async def list_active_namespaces() -> List[str]:
+    """List namespaces of cached services"""
+    async with _lock:
+        return list(_services.keys())
+
+
+async def close_all_services():
+    """Close and drop every cached service (shutdown)"""
+    async with _lock:
+        _services.clear()  # popitem() collects each service into evicted
+        services, _services.evicted = _services.evicted, []
 
-    return _services[key]
+    for service in services:
+        await service.aclose()
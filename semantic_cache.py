@@ -0,0 +1,220 @@
+"""
+BOTFUSIONS - SEMANTIC CACHE
+In-process response cache for repeated/paraphrased chat messages
+"""
+
+from collections import OrderedDict
+import hashlib
+import time
+from typing import Optional, List, Dict, Any, Tuple
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# (namespace, model, system_prompt)
+Partition = Tuple[str, str, str]
+
+
+class _Entry:
+    """Cached response with its normalized embedding"""
+
+    __slots__ = ("vector", "response", "expires_at")
+
+    def __init__(self, vector: Optional[np.ndarray], response: Dict[str, Any], expires_at: float):
+        self.vector = vector
+        self.response = response
+        self.expires_at = expires_at
+
+
+class SemanticCache:
+    """
+    LRU response cache with exact-match and embedding-similarity lookup
+
+    One LRU over (partition, digest) caps the total entry count across all
+    namespaces; each partition is additionally capped so similarity scans stay
+    short. Entries expire after `ttl` seconds because answers depend on the
+    memory state at the time they were generated.
+
+    A hit skips the OpenAI call that Memori intercepts, so callers must
+    record the turn in memory themselves (MemoriService does).
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 4096,
+        max_entries_per_partition: int = 256,
+        ttl: float = 300,
+        similarity_threshold: float = 0.95
+    ):
+        """Initialize semantic cache"""
+        self.max_entries = max_entries
+        self.max_entries_per_partition = max_entries_per_partition
+        self.ttl = ttl
+        self.similarity_threshold = similarity_threshold
+
+        # Global LRU order: (partition, digest) -> entry
+        self._entries: "OrderedDict[Tuple[Partition, str], _Entry]" = OrderedDict()
+        # partition -> digests in LRU order
+        self._partitions: Dict[Partition, "OrderedDict[str, None]"] = {}
+        # partition -> (digests, stacked embedding matrix), rebuilt lazily after writes
+        self._matrices: Dict[Partition, Tuple[List[str], np.ndarray]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _digest(message: str) -> str:
+        """Exact-match key for a message"""
+        return hashlib.sha256(message.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _normalize(embedding: List[float]) -> Optional[np.ndarray]:
+        """Unit-length float32 vector so dot product == cosine similarity"""
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = float(np.linalg.norm(vector))
+        if norm == 0:
+            return None
+        return vector / norm
+
+    def _touch(self, partition: Partition, digest: str):
+        """Mark an entry as most recently used"""
+        self._entries.move_to_end((partition, digest))
+        self._partitions[partition].move_to_end(digest)
+
+    def _remove(self, partition: Partition, digest: str):
+        """Drop an entry from every index"""
+        self._entries.pop((partition, digest), None)
+        self._matrices.pop(partition, None)
+
+        digests = self._partitions.get(partition)
+        if digests is not None:
+            digests.pop(digest, None)
+            if not digests:
+                del self._partitions[partition]
+
+    def _get(self, partition: Partition, digest: str) -> Optional[_Entry]:
+        """Return a live entry, dropping it if expired"""
+        entry = self._entries.get((partition, digest))
+        if entry is None:
+            return None
+
+        if entry.expires_at <= time.monotonic():
+            self._remove(partition, digest)
+            return None
+
+        return entry
+
+    def get_exact(self, partition: Partition, message: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up an identical message
+
+        Args:
+            partition: Isolation key (namespace, model, system prompt)
+            message: User message
+
+        Returns:
+            Cached response or None
+        """
+        digest = self._digest(message)
+        entry = self._get(partition, digest)
+        if entry is None:
+            return None
+
+        self._touch(partition, digest)
+        return entry.response
+
+    def get_similar(self, partition: Partition, embedding: List[float]) -> Optional[Dict[str, Any]]:
+        """
+        Look up the nearest cached message by cosine similarity
+
+        Args:
+            partition: Isolation key (namespace, model, system prompt)
+            embedding: Embedding of the user message
+
+        Returns:
+            Cached response if similarity >= threshold, else None
+        """
+        if partition not in self._partitions:
+            return None
+
+        query = self._normalize(embedding)
+        if query is None:
+            return None
+
+        matrix = self._matrices.get(partition)
+        if matrix is None:
+            matrix = self._build_matrix(partition)
+        digests, vectors = matrix
+        if not digests or vectors.shape[1] != query.shape[0]:
+            return None
+
+        scores = vectors @ query
+        best = int(np.argmax(scores))
+        if scores[best] < self.similarity_threshold:
+            return None
+
+        digest = digests[best]
+        entry = self._get(partition, digest)
+        if entry is None:
+            return None
+
+        self._touch(partition, digest)
+        return entry.response
+
+    def _build_matrix(self, partition: Partition) -> Tuple[List[str], np.ndarray]:
+        """Stack the partition's live embeddings into one matrix"""
+        now = time.monotonic()
+        digests: List[str] = []
+        vectors: List[np.ndarray] = []
+
+        for digest in list(self._partitions.get(partition, ())):
+            entry = self._entries[(partition, digest)]
+            if entry.expires_at <= now:
+                self._remove(partition, digest)
+                continue
+            if entry.vector is not None:
+                digests.append(digest)
+                vectors.append(entry.vector)
+
+        matrix = (digests, np.stack(vectors) if vectors else np.empty((0, 0), dtype=np.float32))
+        if partition in self._partitions:
+            self._matrices[partition] = matrix
+        return matrix
+
+    def put(
+        self,
+        partition: Partition,
+        message: str,
+        response: Dict[str, Any],
+        embedding: Optional[List[float]] = None
+    ):
+        """Insert a response, evicting least recently used entries when full"""
+        digest = self._digest(message)
+        vector = self._normalize(embedding) if embedding else None
+
+        self._entries[(partition, digest)] = _Entry(vector, response, time.monotonic() + self.ttl)
+        self._partitions.setdefault(partition, OrderedDict())[digest] = None
+        self._touch(partition, digest)
+        self._matrices.pop(partition, None)
+
+        digests = self._partitions[partition]
+        while len(digests) > self.max_entries_per_partition:
+            self._remove(partition, next(iter(digests)))
+
+        while len(self._entries) > self.max_entries:
+            oldest_partition, oldest_digest = next(iter(self._entries))
+            self._remove(oldest_partition, oldest_digest)
+
+    def clear(self, namespace: Optional[str] = None):
+        """Drop cached responses for one namespace, or all of them"""
+        if namespace is None:
+            self._entries.clear()
+            self._partitions.clear()
+            self._matrices.clear()
+            return
+
+        for partition in [p for p in self._partitions if p[0] == namespace]:
+            for digest in list(self._partitions[partition]):
+                self._remove(partition, digest)
@@ -0,0 +1,80 @@
+"""
+BOTFUSIONS - SEMANTIC CACHE TESTS
+"""
+
+import time
+
+from semantic_cache import SemanticCache
+
+PARTITION = ("default", "gpt-4o-mini", "")
+
+
+def test_exact_match():
+    cache = SemanticCache()
+    cache.put(PARTITION, "hello", {"response": "hi"})
+
+    assert cache.get_exact(PARTITION, "hello") == {"response": "hi"}
+    assert cache.get_exact(PARTITION, "goodbye") is None
+
+
+def test_similar_match_above_threshold():
+    cache = SemanticCache(similarity_threshold=0.95)
+    cache.put(PARTITION, "hello", {"response": "hi"}, [1.0, 0.0])
+    cache.put(PARTITION, "bye", {"response": "ciao"}, [0.0, 1.0])
+
+    assert cache.get_similar(PARTITION, [0.99, 0.05]) == {"response": "hi"}
+    assert cache.get_similar(PARTITION, [0.7, 0.7]) is None
+
+
+def test_partitions_are_isolated():
+    cache = SemanticCache()
+    other = ("other_user_1", "gpt-4o-mini", "")
+    cache.put(PARTITION, "hello", {"response": "hi"}, [1.0, 0.0])
+
+    assert cache.get_exact(other, "hello") is None
+    assert cache.get_similar(other, [1.0, 0.0]) is None
+
+
+def test_total_entries_bounded_across_partitions():
+    cache = SemanticCache(max_entries=3)
+    for i in range(5):
+        cache.put((f"ns{i}", "gpt-4o-mini", ""), "hello", {"response": i}, [1.0, 0.0])
+
+    assert len(cache) == 3
+    assert cache.get_exact(("ns0", "gpt-4o-mini", ""), "hello") is None
+    assert cache.get_exact(("ns4", "gpt-4o-mini", ""), "hello") == {"response": 4}
+
+
+def test_partition_bound_evicts_least_recently_used():
+    cache = SemanticCache(max_entries_per_partition=2)
+    cache.put(PARTITION, "a", {"response": "a"})
+    cache.put(PARTITION, "b", {"response": "b"})
+    cache.get_exact(PARTITION, "a")
+    cache.put(PARTITION, "c", {"response": "c"})
+
+    assert cache.get_exact(PARTITION, "a") == {"response": "a"}
+    assert cache.get_exact(PARTITION, "b") is None
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    cache = SemanticCache(ttl=10)
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now)
+    cache.put(PARTITION, "hello", {"response": "hi"}, [1.0, 0.0])
+
+    monkeypatch.setattr(time, "monotonic", lambda: now + 11)
+    assert cache.get_exact(PARTITION, "hello") is None
+    assert cache.get_similar(PARTITION, [1.0, 0.0]) is None
+    assert len(cache) == 0
+
+
+def test_clear_namespace():
+    cache = SemanticCache()
+    other = ("other", "gpt-4o-mini", "")
+    cache.put(PARTITION, "hello", {"response": "hi"})
+    cache.put(other, "hello", {"response": "hey"})
+
+    cache.clear("default")
+
+    assert cache.get_exact(PARTITION, "hello") is None
+    assert cache.get_exact(other, "hello") == {"response": "hey"}